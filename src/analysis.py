@@ -3,48 +3,170 @@ import folium
 from folium import plugins
 import numpy as np
 from datetime import datetime, timedelta
+import io
 import json
 import os
 from typing import Optional, List, Dict, Any
-import matplotlib.pyplot as plt
-import seaborn as sns
-from matplotlib.colors import LinearSegmentedColormap
 import webbrowser
 
+try:
+    import numexpr as ne
+except ImportError:  # numexpr is optional; plain NumPy is used without it
+    ne = None
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; jitted helpers then run as plain Python
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+
+@njit(cache=True, fastmath=True)
+def _path_length_km(lat, lon):
+    """
+    Great-circle length of a track using the haversine formula
+    
+    Args:
+        lat: Array of latitudes in degrees, in flight order
+        lon: Array of longitudes in degrees, in flight order
+        
+    Returns:
+        Total length of the track in kilometers
+    """
+    length = 0.0
+    for i in range(1, lat.shape[0]):
+        lat1 = np.radians(lat[i - 1])
+        lat2 = np.radians(lat[i])
+        dlat = lat2 - lat1
+        dlon = np.radians(lon[i] - lon[i - 1])
+        a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+        length += 2 * 6371.0 * np.arcsin(np.sqrt(a))
+    return length
+
+
 class AircraftMapAnalyzer:
-    def __init__(self, csv_file: str):
+    def __init__(self, csv_file: str, chunk_size: Optional[int] = None):
         """
         Initialize the analyzer with aircraft data from CSV
         
         Args:
             csv_file: Path to the CSV file containing aircraft data
+            chunk_size: If set, stream the CSV in chunks of this many rows to limit peak memory
         """
         self.csv_file = csv_file
+        self.chunk_size = chunk_size
         self.data = None
+        self._center = None
+        self._icao_counts = None
         self.load_data()
     
     def load_data(self):
         """Load and preprocess the aircraft data from CSV"""
         try:
-            self.data = pd.read_csv(self.csv_file)
+            # Measurements are read straight into float32 to halve the bytes touched
+            # by every later pass (and per chunk when streaming). Coordinates stay
+            # float64 since they are written verbatim into the generated maps.
+            dtypes = {
+                'icao24': 'string',
+                'callsign': 'string',
+                'squawk': 'string',
+                'latitude': 'float64',
+                'longitude': 'float64',
+                'baro_altitude': 'float32',
+                'geo_altitude': 'float32',
+                'velocity': 'float32',
+                'true_track': 'float32',
+                'vertical_rate': 'float32'
+            }
+            
+            if self.chunk_size:
+                # Stream the file and drop rows with missing coordinates per chunk,
+                # so only one raw chunk is held in memory alongside the kept rows
+                parts = [
+                    chunk.dropna(subset=['latitude', 'longitude'])
+                    for chunk in pd.read_csv(
+                        self.csv_file,
+                        chunksize=self.chunk_size,
+                        engine='c',
+                        parse_dates=['timestamp'],
+                        date_format='ISO8601',
+                        dtype=dtypes
+                    )
+                ]
+                self.data = pd.concat(parts, ignore_index=True)
+                
+                # Match the pyarrow path's timestamp resolution
+                self.data['timestamp'] = self.data['timestamp'].astype('datetime64[ns]')
+            else:
+                # Use Arrow's multithreaded CSV reader with explicit types so no
+                # column needs type inference; timestamps are parsed while reading
+                self.data = pd.read_csv(
+                    self.csv_file,
+                    engine='pyarrow',
+                    parse_dates=['timestamp'],
+                    dtype=dtypes
+                )
+                
+                # Remove rows with missing coordinates
+                self.data = self.data.dropna(subset=['latitude', 'longitude'])
+            
+            # Aircraft IDs as categories so sorting and grouping compare integer codes
+            self.data['icao24'] = self.data['icao24'].astype('category')
             
-            # Convert timestamp to datetime
-            self.data['timestamp'] = pd.to_datetime(self.data['timestamp'])
+            # Sort once by timestamp, then aircraft, so builders need no re-sort
+            self.data = self.data.sort_values(['timestamp', 'icao24'], kind='stable', ignore_index=True)
             
-            # Remove rows with missing coordinates
-            self.data = self.data.dropna(subset=['latitude', 'longitude'])
+            # Cache per-aircraft record counts shared by the statistics and debug output
+            self._icao_counts = self.data['icao24'].value_counts()
             
-            # Sort by timestamp
-            self.data = self.data.sort_values('timestamp')
+            # Cache the map center shared by all map builders
+            self._center = (float(self.data['latitude'].mean()), float(self.data['longitude'].mean()))
             
             print(f"Loaded {len(self.data)} aircraft records")
             print(f"Time range: {self.data['timestamp'].min()} to {self.data['timestamp'].max()}")
-            print(f"Unique aircraft: {self.data['icao24'].nunique()}")
+            print(f"Unique aircraft: {self._icao_counts.size}")
             
         except Exception as e:
             print(f"Error loading data: {e}")
             self.data = pd.DataFrame()
     
+    def _coalesced_altitude(self, data: pd.DataFrame) -> np.ndarray:
+        """Barometric altitude, falling back to geometric altitude where it is missing"""
+        baro = data['baro_altitude'].to_numpy()
+        geo = data['geo_altitude'].to_numpy()
+        if ne is not None:
+            # Single fused pass over both columns (NaN is the only value not equal to itself)
+            return ne.evaluate("where(baro != baro, geo, baro)")
+        return np.where(np.isnan(baro), geo, baro)
+    
+    def _altitude_colors(self, data: pd.DataFrame):
+        """
+        Coalesce altitude and bucket it into marker colors for every row at once
+        
+        Args:
+            data: Aircraft records to color
+            
+        Returns:
+            Tuple of (altitudes, colors): a Series aligned with data and a list of color names
+        """
+        alt = self._coalesced_altitude(data)
+        alt[np.isnan(alt)] = 0
+        
+        palette = np.array(['red', 'orange', 'green'])
+        if ne is not None:
+            codes = ne.evaluate("where(alt > 10000, 0, where(alt > 5000, 1, 2))")
+        else:
+            codes = np.select([alt > 10000, alt > 5000], [0, 1], default=2)
+        
+        return pd.Series(alt, index=data.index), palette[codes].tolist()
+    
+    def _column_text(self, data: pd.DataFrame, column: str) -> pd.Series:
+        """Render a column as popup text, with 'N/A' for missing values"""
+        values = data[column]
+        return values.astype(str).where(values.notna(), 'N/A')
+    
     def create_static_map(self, output_file: str = "aircraft_map.html"):
         """
         Create a static map showing all aircraft positions
@@ -56,9 +178,8 @@ class AircraftMapAnalyzer:
             print("No data to plot")
             return
         
-        # Calculate map center
-        center_lat = self.data['latitude'].mean()
-        center_lon = self.data['longitude'].mean()
+        # Map center computed once in load_data
+        center_lat, center_lon = self._center
         
         # Create base map
         m = folium.Map(
@@ -67,36 +188,40 @@ class AircraftMapAnalyzer:
             tiles='OpenStreetMap'
         )
         
+        # Color based on altitude
+        altitudes, altitude_colors = self._altitude_colors(self.data)
+        
+        # Create popup info for all records at once
+        popups = (
+            "<b>Aircraft:</b> " + self._column_text(self.data, 'icao24')
+            + "<br><b>Callsign:</b> " + self._column_text(self.data, 'callsign')
+            + "<br><b>Altitude:</b> " + altitudes.astype(str) + " ft"
+            + "<br><b>Speed:</b> " + self._column_text(self.data, 'velocity') + " knots"
+            + "<br><b>Track:</b> " + self._column_text(self.data, 'true_track') + "°"
+            + "<br><b>Time:</b> " + self.data['timestamp'].astype(str)
+            + "<br><b>On Ground:</b> " + self._column_text(self.data, 'on_ground')
+        ).tolist()
+        
+        # Ship markers as plain [lat, lon, color, popup] rows; the browser builds
+        # and clusters them, so only the visible clusters are drawn
+        marker_rows = [
+            [lat, lon, color, popup_text]
+            for (lat, lon), color, popup_text in zip(
+                self.data[['latitude', 'longitude']].to_numpy().tolist(), altitude_colors, popups
+            )
+        ]
+        marker_callback = """
+        function (row) {
+            var marker = L.circleMarker(new L.LatLng(row[0], row[1]), {
+                radius: 5, color: row[2], fillColor: row[2], fillOpacity: 0.7
+            });
+            marker.bindPopup(row[3]);
+            return marker;
+        }
+        """
+        
         # Add aircraft markers
-        for _, row in self.data.iterrows():
-            # Color based on altitude
-            altitude = row.get('baro_altitude', 0) or row.get('geo_altitude', 0) or 0
-            if altitude > 10000:
-                color = 'red'
-            elif altitude > 5000:
-                color = 'orange'
-            else:
-                color = 'green'
-            
-            # Create popup info
-            popup_text = f"""
-            <b>Aircraft:</b> {row.get('icao24', 'Unknown')}<br>
-            <b>Callsign:</b> {row.get('callsign', 'N/A')}<br>
-            <b>Altitude:</b> {altitude} ft<br>
-            <b>Speed:</b> {row.get('velocity', 'N/A')} knots<br>
-            <b>Track:</b> {row.get('true_track', 'N/A')}°<br>
-            <b>Time:</b> {row['timestamp']}<br>
-            <b>On Ground:</b> {row.get('on_ground', 'N/A')}
-            """
-            
-            folium.CircleMarker(
-                location=[row['latitude'], row['longitude']],
-                radius=5,
-                popup=popup_text,
-                color=color,
-                fillColor=color,
-                fillOpacity=0.7
-            ).add_to(m)
+        plugins.FastMarkerCluster(data=marker_rows, callback=marker_callback).add_to(m)
         
         # Add legend
         legend_html = '''
@@ -128,9 +253,8 @@ class AircraftMapAnalyzer:
             print("No data to plot")
             return
         
-        # Calculate map center
-        center_lat = self.data['latitude'].mean()
-        center_lon = self.data['longitude'].mean()
+        # Map center computed once in load_data
+        center_lat, center_lon = self._center
         
         # Create base map
         m = folium.Map(
@@ -147,52 +271,39 @@ class AircraftMapAnalyzer:
         else:
             avg_interval = 60  # Default to 1 minute
         
-        # Group by aircraft and create features for each time point
-        features = []
-        
-        # Sort data by timestamp first
-        sorted_data = self.data.sort_values(['timestamp', 'icao24'])
-        
-        for _, row in sorted_data.iterrows():
-            # Color based on altitude
-            altitude = row.get('baro_altitude', 0) or row.get('geo_altitude', 0) or 0
-            if altitude > 10000:
-                color = 'red'
-            elif altitude > 5000:
-                color = 'orange'
-            else:
-                color = 'green'
-            
-            # Convert timestamp to string format that TimestampedGeoJson expects
-            time_str = row['timestamp'].strftime('%Y-%m-%dT%H:%M:%S')
-            
-            feature = {
-                "type": "Feature",
-                "geometry": {
-                    "type": "Point",
-                    "coordinates": [row['longitude'], row['latitude']]
-                },
-                "properties": {
-                    "time": time_str,
-                    "style": {"color": color, "fillColor": color, "radius": 6},
-                    "icon": "circle",
-                    "iconstyle": {
-                        "fillColor": color,
-                        "fillOpacity": 0.8,
-                        "stroke": True,
-                        "radius": 6
-                    },
-                    "popup": f"""
-                    <b>Aircraft:</b> {row.get('icao24', 'Unknown')}<br>
-                    <b>Callsign:</b> {row.get('callsign', 'N/A')}<br>
-                    <b>Altitude:</b> {altitude} ft<br>
-                    <b>Speed:</b> {row.get('velocity', 'N/A')} knots<br>
-                    <b>Time:</b> {row['timestamp']}<br>
-                    <b>Track:</b> {row.get('true_track', 'N/A')}°
-                    """
-                }
-            }
-            features.append(feature)
+        # Data is already sorted by timestamp and aircraft in load_data
+        sorted_data = self.data
+        
+        # Color based on altitude
+        altitudes, altitude_colors = self._altitude_colors(sorted_data)
+        
+        # Create popup info for all records at once, as JSON string literals
+        popups = (
+            "<b>Aircraft:</b> " + self._column_text(sorted_data, 'icao24')
+            + "<br><b>Callsign:</b> " + self._column_text(sorted_data, 'callsign')
+            + "<br><b>Altitude:</b> " + altitudes.astype(str) + " ft"
+            + "<br><b>Speed:</b> " + self._column_text(sorted_data, 'velocity') + " knots"
+            + "<br><b>Time:</b> " + sorted_data['timestamp'].astype(str)
+            + "<br><b>Track:</b> " + self._column_text(sorted_data, 'true_track') + "°"
+        ).map(json.dumps)
+        
+        colors = pd.Series(altitude_colors, index=sorted_data.index)
+        
+        # Convert timestamps to string format that TimestampedGeoJson expects
+        time_strs = sorted_data['timestamp'].dt.strftime('%Y-%m-%dT%H:%M:%S')
+        
+        # Write each feature's GeoJSON directly with columnar string concatenation,
+        # so no per-row dicts are built and nothing needs re-serializing
+        features = (
+            '{"type": "Feature", "geometry": {"type": "Point", "coordinates": ['
+            + sorted_data['longitude'].astype(str) + ', ' + sorted_data['latitude'].astype(str)
+            + ']}, "properties": {"time": "' + time_strs
+            + '", "style": {"color": "' + colors + '", "fillColor": "' + colors + '", "radius": 6}'
+            + ', "icon": "circle", "iconstyle": {"fillColor": "' + colors
+            + '", "fillOpacity": 0.8, "stroke": true, "radius": 6}'
+            + ', "popup": ' + popups + '}}'
+        )
+        features_json = '{"type": "FeatureCollection", "features": [' + ', '.join(features) + ']}'
         
         print(f"Created {len(features)} time-based features for animation")
         
@@ -205,11 +316,9 @@ class AircraftMapAnalyzer:
             period = "PT1M"   # 1 minute intervals
         
         # Add TimestampedGeoJson layer
+        # A file-like object is embedded as-is rather than passed through json.dumps
         plugins.TimestampedGeoJson(
-            {
-                "type": "FeatureCollection",
-                "features": features
-            },
+            io.StringIO(features_json),
             period=period,
             add_last_point=False,
             auto_play=False,
@@ -226,21 +335,26 @@ class AircraftMapAnalyzer:
         print(f"Animated map saved to {output_file}")
         return m
     
-    def create_flight_paths(self, output_file: str = "flight_paths.html", min_points: int = 2):
+    def create_flight_paths(self, output_file: str = "flight_paths.html", min_points: int = 2,
+                            max_intermediate_points: int = 20):
         """
         Create a map showing flight paths for aircraft with multiple data points
         
         Args:
             output_file: Output HTML file name
             min_points: Minimum number of points required to draw a path
+            max_intermediate_points: Maximum number of intermediate point markers per path (0 for none)
         """
+        if max_intermediate_points < 0:
+            print(f"max_intermediate_points must be >= 0, got {max_intermediate_points}")
+            return
+        
         if self.data.empty:
             print("No data to plot")
             return
         
-        # Calculate map center
-        center_lat = self.data['latitude'].mean()
-        center_lon = self.data['longitude'].mean()
+        # Map center computed once in load_data
+        center_lat, center_lon = self._center
         
         # Create base map
         m = folium.Map(
@@ -249,104 +363,136 @@ class AircraftMapAnalyzer:
             tiles='OpenStreetMap'
         )
         
-        # Group by aircraft and sort by time
-        aircraft_groups = self.data.groupby('icao24')
+        # Sort by aircraft and time once, then remove any duplicate positions (same lat/lon)
+        track_data = self.data.sort_values(['icao24', 'timestamp'], kind='stable')
+        track_data = track_data.drop_duplicates(subset=['icao24', 'latitude', 'longitude'], keep='first')
+        track_data = track_data.assign(
+            callsign_text=self._column_text(track_data, 'callsign'),
+            altitude_text=self._column_text(track_data, 'baro_altitude'),
+            speed_text=self._column_text(track_data, 'velocity')
+        )
+        
+        # Collect each aircraft's track as per-column lists in one groupby pass
+        paths = track_data.groupby('icao24', sort=False, observed=True).agg(
+            lat=('latitude', list),
+            lon=('longitude', list),
+            times=('timestamp', list),
+            altitude=('altitude_text', list),
+            speed=('speed_text', list),
+            callsign=('callsign_text', list)
+        ).reset_index()
         
         colors = ['red', 'blue', 'green', 'purple', 'orange', 'darkred', 
                   'lightred', 'beige', 'darkblue', 'darkgreen', 'cadetblue', 
                   'darkpurple', 'pink', 'lightblue', 'lightgreen', 
                   'gray', 'black', 'lightgray']
         
-        color_idx = 0
+        # Choose each aircraft's color from its category code, so an aircraft
+        # keeps the same color regardless of which other paths are drawn
+        palette = np.asarray(colors)
+        paths['color'] = palette[paths['icao24'].cat.codes.to_numpy() % len(palette)]
+        
         paths_created = 0
+        intermediate_rows = []
         
-        print(f"Processing {len(aircraft_groups)} aircraft for flight paths...")
+        print(f"Processing {len(paths)} aircraft for flight paths...")
         
-        for aircraft_id, group in aircraft_groups:
-            # Sort by timestamp
-            group = group.sort_values('timestamp').reset_index(drop=True)
+        for path in paths.itertuples(index=False):
+            if len(path.lat) < min_points:
+                continue
             
-            if len(group) >= min_points:
-                # Remove any duplicate positions (same lat/lon)
-                group = group.drop_duplicates(subset=['latitude', 'longitude'], keep='first')
-                
-                if len(group) >= min_points:
-                    # Create coordinates list [lat, lon] for folium
-                    coordinates = []
-                    times = []
-                    
-                    for _, row in group.iterrows():
-                        coordinates.append([row['latitude'], row['longitude']])
-                        times.append(row['timestamp'])
-                    
-                    if len(coordinates) >= min_points:
-                        # Choose color
-                        color = colors[color_idx % len(colors)]
-                        color_idx += 1
-                        
-                        # Add flight path
-                        folium.PolyLine(
-                            coordinates,
-                            color=color,
-                            weight=3,
-                            opacity=0.8,
-                            popup=f"""
-                            <b>Aircraft:</b> {aircraft_id}<br>
-                            <b>Callsign:</b> {group.iloc[0].get('callsign', 'N/A')}<br>
-                            <b>Points:</b> {len(coordinates)}<br>
-                            <b>Duration:</b> {times[-1] - times[0]}<br>
-                            <b>Start:</b> {times[0]}<br>
-                            <b>End:</b> {times[-1]}
-                            """
-                        ).add_to(m)
-                        
-                        # Add start marker (green)
-                        start_row = group.iloc[0]
-                        folium.Marker(
-                            [start_row['latitude'], start_row['longitude']],
-                            icon=folium.Icon(color='green', icon='play'),
-                            popup=f"""
-                            <b>START</b><br>
-                            Aircraft: {aircraft_id}<br>
-                            Callsign: {start_row.get('callsign', 'N/A')}<br>
-                            Time: {start_row['timestamp']}<br>
-                            Altitude: {start_row.get('baro_altitude', 'N/A')} ft
-                            """
-                        ).add_to(m)
-                        
-                        # Add end marker (red)
-                        end_row = group.iloc[-1]
-                        folium.Marker(
-                            [end_row['latitude'], end_row['longitude']],
-                            icon=folium.Icon(color='red', icon='stop'),
-                            popup=f"""
-                            <b>END</b><br>
-                            Aircraft: {aircraft_id}<br>
-                            Callsign: {end_row.get('callsign', 'N/A')}<br>
-                            Time: {end_row['timestamp']}<br>
-                            Altitude: {end_row.get('baro_altitude', 'N/A')} ft
-                            """
-                        ).add_to(m)
-                        
-                        # Add intermediate points with timestamps
-                        for i, (_, row) in enumerate(group.iterrows()):
-                            if i > 0 and i < len(group) - 1:  # Skip start and end
-                                folium.CircleMarker(
-                                    [row['latitude'], row['longitude']],
-                                    radius=3,
-                                    popup=f"""
-                                    <b>Point {i+1}</b><br>
-                                    Aircraft: {aircraft_id}<br>
-                                    Time: {row['timestamp']}<br>
-                                    Altitude: {row.get('baro_altitude', 'N/A')} ft<br>
-                                    Speed: {row.get('velocity', 'N/A')} knots
-                                    """,
-                                    color=color,
-                                    fillColor=color,
-                                    fillOpacity=0.7
-                                ).add_to(m)
-                        
-                        paths_created += 1
+            aircraft_id = path.icao24
+            times = path.times
+            
+            # Create coordinates list [lat, lon] for folium
+            coordinates = [list(point) for point in zip(path.lat, path.lon)]
+            
+            color = path.color
+            
+            # Add flight path
+            folium.PolyLine(
+                coordinates,
+                color=color,
+                weight=3,
+                opacity=0.8,
+                popup=f"""
+                <b>Aircraft:</b> {aircraft_id}<br>
+                <b>Callsign:</b> {path.callsign[0]}<br>
+                <b>Points:</b> {len(coordinates)}<br>
+                <b>Distance:</b> {_path_length_km(np.asarray(path.lat), np.asarray(path.lon)):.1f} km<br>
+                <b>Duration:</b> {times[-1] - times[0]}<br>
+                <b>Start:</b> {times[0]}<br>
+                <b>End:</b> {times[-1]}
+                """
+            ).add_to(m)
+            
+            # Add start marker (green)
+            folium.Marker(
+                coordinates[0],
+                icon=folium.Icon(color='green', icon='play'),
+                popup=f"""
+                <b>START</b><br>
+                Aircraft: {aircraft_id}<br>
+                Callsign: {path.callsign[0]}<br>
+                Time: {times[0]}<br>
+                Altitude: {path.altitude[0]} ft
+                """
+            ).add_to(m)
+            
+            # Add end marker (red)
+            folium.Marker(
+                coordinates[-1],
+                icon=folium.Icon(color='red', icon='stop'),
+                popup=f"""
+                <b>END</b><br>
+                Aircraft: {aircraft_id}<br>
+                Callsign: {path.callsign[-1]}<br>
+                Time: {times[-1]}<br>
+                Altitude: {path.altitude[-1]} ft
+                """
+            ).add_to(m)
+            
+            # Collect intermediate points with timestamps (skip start and end),
+            # subsampled so long flights don't flood the map with markers
+            intermediate_idx = range(0)
+            if max_intermediate_points > 0:
+                step = max(1, -(-(len(coordinates) - 2) // max_intermediate_points))
+                intermediate_idx = range(1, len(coordinates) - 1, step)
+            for i in intermediate_idx:
+                intermediate_rows.append([
+                    path.lat[i],
+                    path.lon[i],
+                    color,
+                    f"""
+                    <b>Point {i+1}</b><br>
+                    Aircraft: {aircraft_id}<br>
+                    Time: {times[i]}<br>
+                    Altitude: {path.altitude[i]} ft<br>
+                    Speed: {path.speed[i]} knots
+                    """
+                ])
+            
+            paths_created += 1
+        
+        # Ship intermediate points as plain [lat, lon, color, popup] rows; the
+        # browser builds each circle marker with its own popup and clusters them,
+        # only drawing individual points once zoomed in
+        if intermediate_rows:
+            intermediate_callback = """
+            function (row) {
+                var marker = L.circleMarker(new L.LatLng(row[0], row[1]), {
+                    radius: 3, color: row[2], fillColor: row[2], fillOpacity: 0.7
+                });
+                marker.bindPopup(row[3]);
+                return marker;
+            }
+            """
+            plugins.FastMarkerCluster(
+                data=intermediate_rows,
+                callback=intermediate_callback,
+                chunked_loading=True,
+                disable_clustering_at_zoom=10
+            ).add_to(m)
         
         print(f"Created {paths_created} flight paths")
         
@@ -381,9 +527,8 @@ class AircraftMapAnalyzer:
             print("No data to plot")
             return
         
-        # Calculate map center
-        center_lat = self.data['latitude'].mean()
-        center_lon = self.data['longitude'].mean()
+        # Map center computed once in load_data
+        center_lat, center_lon = self._center
         
         # Create base map
         m = folium.Map(
@@ -393,7 +538,7 @@ class AircraftMapAnalyzer:
         )
         
         # Prepare data for heatmap
-        heat_data = [[row['latitude'], row['longitude']] for _, row in self.data.iterrows()]
+        heat_data = self.data[['latitude', 'longitude']].to_numpy(dtype=np.float64).tolist()
         
         # Add heatmap
         plugins.HeatMap(heat_data).add_to(m)
@@ -413,7 +558,7 @@ class AircraftMapAnalyzer:
         
         # Basic stats
         print(f"Total records: {len(self.data)}")
-        print(f"Unique aircraft: {self.data['icao24'].nunique()}")
+        print(f"Unique aircraft: {self._icao_counts.size}")
         print(f"Time span: {self.data['timestamp'].max() - self.data['timestamp'].min()}")
         
         # Time interval analysis
@@ -424,7 +569,7 @@ class AircraftMapAnalyzer:
             print(f"Data collection frequency: Every ~{avg_interval/60:.1f} minutes")
         
         # Aircraft tracking analysis
-        aircraft_counts = self.data['icao24'].value_counts()
+        aircraft_counts = self._icao_counts
         print(f"\nAircraft Tracking:")
         print(f"  Aircraft with >1 data point: {(aircraft_counts > 1).sum()}")
         print(f"  Aircraft with >5 data points: {(aircraft_counts > 5).sum()}")
@@ -432,13 +577,14 @@ class AircraftMapAnalyzer:
         print(f"  Max data points for one aircraft: {aircraft_counts.max()}")
         
         # Altitude stats
-        altitudes = self.data['baro_altitude'].fillna(self.data['geo_altitude']).dropna()
-        if not altitudes.empty:
+        altitudes = self._coalesced_altitude(self.data)
+        altitude_count = np.count_nonzero(~np.isnan(altitudes))
+        if altitude_count:
             print(f"\nAltitude Statistics:")
-            print(f"  Mean altitude: {altitudes.mean():.0f} ft")
-            print(f"  Max altitude: {altitudes.max():.0f} ft")
-            print(f"  Min altitude: {altitudes.min():.0f} ft")
-            print(f"  Records with altitude data: {len(altitudes)}/{len(self.data)} ({len(altitudes)/len(self.data)*100:.1f}%)")
+            print(f"  Mean altitude: {np.nanmean(altitudes, dtype=np.float64):.0f} ft")
+            print(f"  Max altitude: {np.nanmax(altitudes):.0f} ft")
+            print(f"  Min altitude: {np.nanmin(altitudes):.0f} ft")
+            print(f"  Records with altitude data: {altitude_count}/{len(self.data)} ({altitude_count/len(self.data)*100:.1f}%)")
         
         # Speed stats
         speeds = self.data['velocity'].dropna()
@@ -487,25 +633,33 @@ class AircraftMapAnalyzer:
         
         # Show sample data
         print(f"\nFirst 3 records:")
-        for i, (_, row) in enumerate(self.data.head(3).iterrows()):
+        sample = self.data.head(3)
+        sample_altitudes = self._column_text(sample, 'baro_altitude')
+        for i, (row, altitude) in enumerate(zip(sample.itertuples(index=False), sample_altitudes)):
             print(f"  Record {i+1}:")
-            print(f"    Timestamp: {row['timestamp']}")
-            print(f"    Aircraft: {row.get('icao24', 'N/A')}")
-            print(f"    Position: {row['latitude']}, {row['longitude']}")
-            print(f"    Altitude: {row.get('baro_altitude', 'N/A')}")
+            print(f"    Timestamp: {row.timestamp}")
+            print(f"    Aircraft: {getattr(row, 'icao24', 'N/A')}")
+            print(f"    Position: {row.latitude}, {row.longitude}")
+            print(f"    Altitude: {altitude}")
             print()
         
         # Check for aircraft with multiple data points
-        aircraft_counts = self.data['icao24'].value_counts()
+        aircraft_counts = self._icao_counts
         multi_point_aircraft = aircraft_counts[aircraft_counts > 1].head(5)
         
         if not multi_point_aircraft.empty:
             print("Sample aircraft with multiple data points:")
             for aircraft_id, count in multi_point_aircraft.items():
                 aircraft_data = self.data[self.data['icao24'] == aircraft_id].sort_values('timestamp')
+                # Pull the first and last rows as plain tuples instead of a Series per field
+                (first_time, first_lat, first_lon), (last_time, last_lat, last_lon) = (
+                    aircraft_data[['timestamp', 'latitude', 'longitude']]
+                    .iloc[[0, -1]]
+                    .itertuples(index=False, name=None)
+                )
                 print(f"  {aircraft_id} ({count} points):")
-                print(f"    First: {aircraft_data.iloc[0]['timestamp']} at {aircraft_data.iloc[0]['latitude']:.4f}, {aircraft_data.iloc[0]['longitude']:.4f}")
-                print(f"    Last:  {aircraft_data.iloc[-1]['timestamp']} at {aircraft_data.iloc[-1]['latitude']:.4f}, {aircraft_data.iloc[-1]['longitude']:.4f}")
+                print(f"    First: {first_time} at {first_lat:.4f}, {first_lon:.4f}")
+                print(f"    Last:  {last_time} at {last_lat:.4f}, {last_lon:.4f}")
                 print()
         else:
             print("No aircraft have multiple data points - this is why animations/paths aren't working!")
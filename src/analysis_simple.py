@@ -1,33 +1,75 @@
 import pandas as pd
+import numpy as np
 import folium
+from folium.plugins import FastMarkerCluster, MarkerCluster
+import contextlib
+import shelve
 import webbrowser
 from datetime import datetime
+from typing import Optional
 
 class SimpleAircraftPlotter:
+    # Version of the rendered popup format stored in create_map's cache file;
+    # bump it whenever _render_track's output changes
+    CACHE_VERSION = 1
+    
     def __init__(self, csv_file: str):
         """
         Simple aircraft plotter that shows points and connects them with lines
         
         Args:
-            csv_file: Path to the CSV file containing aircraft data
+            csv_file: Path to the CSV file or Parquet dataset (*.parquet) containing aircraft data
         """
         self.csv_file = csv_file
         self.data = None
         self.load_data()
     
     def load_data(self):
-        """Load aircraft data from CSV"""
+        """Load aircraft data from CSV or Parquet"""
         try:
-            self.data = pd.read_csv(self.csv_file)
-            
-            # Convert timestamp to datetime
-            self.data['timestamp'] = pd.to_datetime(self.data['timestamp'])
+            if self.csv_file.endswith('.parquet'):
+                # Columnar read of only the plotted columns; timestamps are already typed
+                self.data = pd.read_parquet(
+                    self.csv_file,
+                    columns=['icao24', 'timestamp', 'latitude', 'longitude',
+                             'baro_altitude', 'geo_altitude', 'velocity', 'callsign']
+                )
+            else:
+                # Read only the plotted columns with their types given up front;
+                # coordinates and values shown in popups stay float64 so they
+                # print exactly as written
+                self.data = pd.read_csv(
+                    self.csv_file,
+                    usecols=['icao24', 'callsign', 'timestamp', 'latitude', 'longitude',
+                             'baro_altitude', 'geo_altitude', 'velocity'],
+                    dtype={'icao24': 'category', 'callsign': 'string',
+                           'latitude': 'float64', 'longitude': 'float64',
+                           'baro_altitude': 'float64', 'geo_altitude': 'float64',
+                           'velocity': 'float64'}
+                )
+                
+                # Convert timestamp to datetime; the scraper writes ISO 8601, so
+                # skip per-element format inference
+                self.data['timestamp'] = pd.to_datetime(self.data['timestamp'], format='ISO8601', cache=True)
             
             # Remove rows with missing coordinates
             self.data = self.data.dropna(subset=['latitude', 'longitude'])
             
-            # Sort by aircraft and timestamp
-            self.data = self.data.sort_values(['icao24', 'timestamp'])
+            # Sort by aircraft and timestamp; a categorical icao24 compares
+            # integer codes instead of strings
+            self.data['icao24'] = self.data['icao24'].astype('category')
+            self.data = self.data.sort_values(['icao24', 'timestamp'], kind='mergesort')
+            
+            # Coalesce altitude once: barometric, else geometric, else 0
+            self.data['alt'] = self.data['baro_altitude'].fillna(self.data['geo_altitude']).fillna(0)
+            
+            # Cache plotted columns as NumPy arrays for positional slicing per aircraft
+            self._lat = self.data['latitude'].to_numpy()
+            self._lon = self.data['longitude'].to_numpy()
+            self._timestamps = self.data['timestamp'].to_numpy(dtype=object)
+            self._callsigns = self.data['callsign'].fillna('N/A').to_numpy()
+            self._altitudes = self.data['alt'].to_numpy()
+            self._velocities = self.data['velocity'].astype(object).fillna('N/A').to_numpy()
             
             print(f"Loaded {len(self.data)} aircraft records")
             print(f"Unique aircraft: {self.data['icao24'].nunique()}")
@@ -36,12 +78,13 @@ class SimpleAircraftPlotter:
             print(f"Error loading data: {e}")
             self.data = pd.DataFrame()
     
-    def create_map(self, output_file: str = "aircraft_tracks.html"):
+    def create_map(self, output_file: str = "aircraft_tracks.html", cache_file: Optional[str] = None):
         """
         Create a simple map with aircraft points and tracks
         
         Args:
             output_file: Output HTML file name
+            cache_file: Shelve file caching rendered tracks between runs (None to disable)
         """
         if self.data.empty:
             print("No data to plot")
@@ -64,76 +107,97 @@ class SimpleAircraftPlotter:
                   'darkpurple', 'pink', 'lightblue', 'lightgreen', 
                   'gray', 'black', 'brown']
         
-        # Group by aircraft
-        aircraft_groups = self.data.groupby('icao24')
+        # Group by aircraft (row positions only; no per-group DataFrame is built)
+        aircraft_groups = self.data.groupby('icao24', sort=False, observed=True).indices
         color_idx = 0
+        track_lines = []
+        
+        # Start/end markers are clustered so off-screen ones aren't created in
+        # the DOM until the map is panned or zoomed to them
+        endpoint_cluster = MarkerCluster(disable_clustering_at_zoom=12).add_to(m)
+        track_points = []
         
         print(f"Plotting {len(aircraft_groups)} aircraft...")
         
-        for aircraft_id, group in aircraft_groups:
-            # Sort by timestamp
-            group = group.sort_values('timestamp').reset_index(drop=True)
+        # Coordinates and popup HTML per aircraft, reusing cached unchanged tracks
+        tracks = self._rendered_tracks(aircraft_groups, cache_file)
+        
+        for aircraft_id, idx in aircraft_groups.items():
+            n_points = len(idx)
             
             # Choose color for this aircraft
             color = colors[color_idx % len(colors)]
             color_idx += 1
             
-            # If aircraft has multiple points, draw lines between them
-            if len(group) > 1:
-                # Create coordinates list for the line
-                coordinates = []
-                for _, row in group.iterrows():
-                    coordinates.append([row['latitude'], row['longitude']])
-                
-                # Draw the flight path line
-                folium.PolyLine(
-                    coordinates,
-                    color=color,
-                    weight=3,
-                    opacity=0.7,
-                    popup=f"Aircraft: {aircraft_id}<br>Points: {len(coordinates)}"
-                ).add_to(m)
+            coordinates, popups = tracks[aircraft_id]
+            
+            # If aircraft has multiple points, collect its flight path line
+            # (GeoJSON positions are [lon, lat])
+            if n_points > 1:
+                track_lines.append({
+                    "type": "Feature",
+                    "geometry": {
+                        "type": "LineString",
+                        "coordinates": [[lon, lat] for lat, lon in coordinates]
+                    },
+                    "properties": {
+                        "icao24": aircraft_id,
+                        "color": color,
+                        "popup": f"Aircraft: {aircraft_id}<br>Points: {n_points}"
+                    }
+                })
             
             # Plot all points for this aircraft
-            for i, (_, row) in enumerate(group.iterrows()):
-                # Get altitude for color coding
-                altitude = row.get('baro_altitude', 0) or row.get('geo_altitude', 0) or 0
-                
-                # Create popup info
-                popup_text = f"""
-                <b>Aircraft:</b> {aircraft_id}<br>
-                <b>Callsign:</b> {row.get('callsign', 'N/A')}<br>
-                <b>Point:</b> {i+1} of {len(group)}<br>
-                <b>Time:</b> {row['timestamp']}<br>
-                <b>Altitude:</b> {altitude} ft<br>
-                <b>Speed:</b> {row.get('velocity', 'N/A')} knots
-                """
+            for i in range(n_points):
+                popup_text = popups[i]
                 
                 # Different marker for first and last points
-                if i == 0 and len(group) > 1:
+                if i == 0 and n_points > 1:
                     # First point - green marker
                     folium.Marker(
-                        [row['latitude'], row['longitude']],
+                        coordinates[i],
                         icon=folium.Icon(color='green', icon='play'),
                         popup=f"START<br>{popup_text}"
-                    ).add_to(m)
-                elif i == len(group) - 1 and len(group) > 1:
+                    ).add_to(endpoint_cluster)
+                elif i == n_points - 1 and n_points > 1:
                     # Last point - red marker
                     folium.Marker(
-                        [row['latitude'], row['longitude']],
+                        coordinates[i],
                         icon=folium.Icon(color='red', icon='stop'),
                         popup=f"END<br>{popup_text}"
-                    ).add_to(m)
+                    ).add_to(endpoint_cluster)
                 else:
-                    # Middle points or single points - colored circles
-                    folium.CircleMarker(
-                        location=[row['latitude'], row['longitude']],
-                        radius=5,
-                        popup=popup_text,
-                        color=color,
-                        fillColor=color,
-                        fillOpacity=0.7
-                    ).add_to(m)
+                    # Middle points or single points - colored circles, built in the browser
+                    track_points.append([*coordinates[i], color, popup_text])
+        
+        # Add all flight paths as one GeoJSON layer, drawn by a single L.geoJSON call
+        if track_lines:
+            folium.GeoJson(
+                {"type": "FeatureCollection", "features": track_lines},
+                style_function=lambda feature: {
+                    "color": feature['properties']['color'],
+                    "weight": 3,
+                    "opacity": 0.7
+                },
+                popup=folium.GeoJsonPopup(fields=['popup'], labels=False)
+            ).add_to(m)
+        
+        # Add all middle/single points as one clustered layer; the browser
+        # creates the circle markers from the raw rows
+        track_point_callback = """
+        function (row) {
+            var marker = L.circleMarker(new L.LatLng(row[0], row[1]), {
+                radius: 3, color: row[2], fillColor: row[2], fillOpacity: 0.7
+            });
+            marker.bindPopup(row[3]);
+            return marker;
+        }
+        """
+        FastMarkerCluster(
+            data=track_points,
+            callback=track_point_callback,
+            disable_clustering_at_zoom=12
+        ).add_to(m)
         
         # Add a simple legend
         legend_html = f'''
@@ -165,6 +229,76 @@ class SimpleAircraftPlotter:
         
         return m
     
+    def _rendered_tracks(self, aircraft_groups, cache_file=None):
+        """
+        Build every aircraft's coordinates and popups, reusing unchanged tracks from a cache file
+        
+        Args:
+            aircraft_groups: Row positions per aircraft, from groupby().indices
+            cache_file: Shelve file caching rendered tracks between runs (None to disable)
+        """
+        tracks = {}
+        
+        with (shelve.open(cache_file) if cache_file else contextlib.nullcontext({})) as cache:
+            # One entry per aircraft holding (last timestamp, point count, track),
+            # overwritten when the track grows; the key carries the format
+            # version so tracks rendered by an older popup format aren't reused
+            keys = {aircraft_id: f"v{self.CACHE_VERSION}:{aircraft_id}" for aircraft_id in aircraft_groups}
+            states = {
+                aircraft_id: (str(self._timestamps[idx[-1]]), len(idx))
+                for aircraft_id, idx in aircraft_groups.items()
+            }
+            
+            missing = []
+            for aircraft_id in aircraft_groups:
+                entry = cache.get(keys[aircraft_id])
+                if entry is not None and entry[:2] == states[aircraft_id]:
+                    tracks[aircraft_id] = entry[2]
+                else:
+                    missing.append(aircraft_id)
+            
+            # Format the uncached tracks
+            for aircraft_id in missing:
+                track = self._render_track(aircraft_id, aircraft_groups[aircraft_id])
+                tracks[aircraft_id] = track
+                cache[keys[aircraft_id]] = (*states[aircraft_id], track)
+        
+        return tracks
+    
+    def _render_track(self, aircraft_id, idx):
+        """
+        Build one aircraft's coordinates and per-point popup HTML
+        
+        Args:
+            aircraft_id: ICAO24 address of the aircraft
+            idx: Row positions of this aircraft's points, in timestamp order
+        """
+        # Rows are already sorted by aircraft and timestamp in load_data;
+        # slice this aircraft's values out of the cached column arrays
+        coordinates = np.column_stack([self._lat[idx], self._lon[idx]]).tolist()
+        timestamps = self._timestamps[idx]
+        callsigns = self._callsigns[idx]
+        altitudes = self._altitudes[idx]
+        velocities = self._velocities[idx]
+        n_points = len(idx)
+        
+        # Popup parts that are the same for every point of this aircraft
+        popup_prefix = f"<b>Aircraft:</b> {aircraft_id}<br>"
+        point_total = f" of {n_points}<br>"
+        
+        popups = []
+        for i in range(n_points):
+            # Create popup info; only the point-specific fields are formatted here
+            popups.append(
+                f"{popup_prefix}<b>Callsign:</b> {callsigns[i]}<br>"
+                f"<b>Point:</b> {i+1}{point_total}"
+                f"<b>Time:</b> {timestamps[i]}<br>"
+                f"<b>Altitude:</b> {altitudes[i]} ft<br>"
+                f"<b>Speed:</b> {velocities[i]} knots"
+            )
+        
+        return coordinates, popups
+    
     def print_summary(self):
         """Print a summary of the data"""
         if self.data.empty:
@@ -4,24 +4,58 @@ import pandas as pd
 
 class Converter:
     def __init__(self):
-        pass
+        # Columns written to each XML measurement
+        self.columns = ['icao24', 'callsign', 'timestamp', 'latitude', 'longitude',
+                        'baro_altitude', 'true_track', 'velocity']
 
-    def convert_csv_to_xml(self, csv_file, xml_file):
+    def build_xml_block(self, df):
+        # Render each written column as text once (missing values are written as "nan")
+        text = {col: df[col].astype(str).fillna('nan') for col in self.columns}
+        
+        # Escape XML markup characters in the free-text columns; numeric columns can't contain them
+        for col in ('icao24', 'callsign', 'timestamp'):
+            text[col] = (text[col]
+                         .str.replace('&', '&amp;', regex=False)
+                         .str.replace('<', '&lt;', regex=False)
+                         .str.replace('>', '&gt;', regex=False))
+        
+        # Build the XML for every measurement at once with vectorized string ops,
+        # one document with header and measurement sections per row
+        xml_lines = (
+            '<?xml version="1.0" encoding="utf-8"?><measurement><header><icao24>' + text['icao24']
+            + '</icao24><callsign>' + text['callsign']
+            + '</callsign></header><data><timestamp>' + text['timestamp']
+            + '</timestamp><latitude>' + text['latitude']
+            + '</latitude><longitude>' + text['longitude']
+            + '</longitude><baro_altitude>' + text['baro_altitude']
+            + '</baro_altitude><true_track>' + text['true_track']
+            + '</true_track><velocity>' + text['velocity']
+            + '</velocity></data></measurement>\n'
+        )
+        return ''.join(xml_lines)
+
+    def convert_csv_to_xml(self, csv_file, xml_file, chunk_size=100_000):
         try:
-            # Read the CSV file
+            # Stream the CSV in chunks so memory stays bounded by the chunk size;
+            # only the written columns are parsed and the IDs skip type inference
             print(f"Reading CSV file: {csv_file}")
-            df = pd.read_csv(csv_file)
-            print(f"Found {len(df)} rows in CSV")
+            chunks = pd.read_csv(
+                csv_file,
+                chunksize=chunk_size,
+                usecols=self.columns,
+                dtype={'icao24': str, 'callsign': str}
+            )
 
             # Write each row as a separate XML document on its own line
             print(f"Writing XML file: {xml_file}")
+            row_count = 0
             
             with open(xml_file, 'w', encoding='utf-8') as f:
-                for index, row in df.iterrows():
-                    # Create XML for this single measurement with header and measurement sections
-                    xml_content = f'<?xml version="1.0" encoding="utf-8"?><measurement><header><icao24>{str(row["icao24"])}</icao24><callsign>{str(row["callsign"])}</callsign></header><data><timestamp>{str(row["timestamp"])}</timestamp><latitude>{str(row["latitude"])}</latitude><longitude>{str(row["longitude"])}</longitude><baro_altitude>{str(row["baro_altitude"])}</baro_altitude><true_track>{str(row["true_track"])}</true_track><velocity>{str(row["velocity"])}</velocity></data></measurement>'
-                    f.write(xml_content + '\n')
+                for chunk in chunks:
+                    f.write(self.build_xml_block(chunk))
+                    row_count += len(chunk)
             
+            print(f"Converted {row_count} rows from CSV")
             print("Conversion completed successfully!")
             
         except Exception as e:
@@ -1,16 +1,65 @@
+import atexit
+import os
 import requests
 import time
-import csv
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 from datetime import datetime
 
 from opensky_api import OpenSkyApi
 
+# State vector fields written per aircraft, in output column order (after timestamp)
+STATE_FIELDS = [
+    "icao24", "callsign", "latitude", "longitude", "baro_altitude",
+    "true_track", "velocity", "vertical_rate", "squawk", "geo_altitude",
+    "on_ground", "last_contact", "spi", "position_source",
+]
+
+# Fixed Parquet column types, so a batch where a column is all None doesn't
+# write it as Arrow's null type and disagree with the rest of the dataset
+PARQUET_SCHEMA = pa.schema([
+    ("timestamp", pa.timestamp("us")),
+    ("icao24", pa.string()),
+    ("callsign", pa.string()),
+    ("latitude", pa.float64()),
+    ("longitude", pa.float64()),
+    ("baro_altitude", pa.float64()),
+    ("true_track", pa.float64()),
+    ("velocity", pa.float64()),
+    ("vertical_rate", pa.float64()),
+    ("squawk", pa.string()),
+    ("geo_altitude", pa.float64()),
+    ("on_ground", pa.bool_()),
+    ("last_contact", pa.int64()),
+    ("spi", pa.bool_()),
+    ("position_source", pa.int64()),
+    ("date", pa.string()),
+])
+
+def record_count(aircraft_data):
+    """Number of records in a column-wise batch"""
+    return len(aircraft_data["timestamp"]) if aircraft_data else 0
+
 class Scrapper:
     def __init__(self):
         print("Using OpenSky API without authentication")
         self.api = OpenSkyApi(username="", password="")
+        
+        # CSV output handle, kept open across batches
+        self._csv_file = None
+        
+        # Single background writer, so a batch's disk writes overlap the next
+        # API requests; one worker keeps the writes in order
+        self._io_pool = ThreadPoolExecutor(max_workers=1)
+        atexit.register(self.close)
+        
+        # Scrape results held in memory (column-wise) until the next flush
+        self._buffer = {}
+        self._buf_cycles = 0
 
     def get_aircraft_data(self, lat_min, lat_max, lon_min, lon_max):
         try:
@@ -18,35 +67,21 @@ class Scrapper:
             print(f"Requesting data for bounds: {bounds}")
             
             states = self.api.get_states(bbox=bounds)
-            aircraft_data = []
+            aircraft_data = {}
             timestamp = datetime.now().isoformat()
             
             if states and states.states:
                 print(f"Found {len(states.states)} aircraft")
-                for state in states.states:
-                    aircraft_data.append({
-                        "timestamp": timestamp,
-                        "icao24": state.icao24,
-                        "callsign": state.callsign,
-                        "latitude": state.latitude,
-                        "longitude": state.longitude,
-                        "baro_altitude": state.baro_altitude,
-                        "true_track": state.true_track,
-                        "velocity": state.velocity,
-                        "vertical_rate": state.vertical_rate,
-                        "squawk": state.squawk,
-                        "geo_altitude": state.geo_altitude,
-                        "on_ground": state.on_ground,
-                        "last_contact": state.last_contact,
-                        "spi": state.spi,
-                        "position_source": state.position_source,
-                    })
+                # Build one list per column rather than one dict per aircraft
+                aircraft_data["timestamp"] = [timestamp] * len(states.states)
+                for field in STATE_FIELDS:
+                    aircraft_data[field] = [getattr(state, field) for state in states.states]
             else:
                 print("No states returned from API for these bounds")
             return aircraft_data
         except Exception as e:
             print(f"Error getting aircraft data: {e}")
-            return []
+            return {}
 
     def save_to_csv(self, aircraft_data, filename):
         try:
@@ -54,34 +89,96 @@ class Scrapper:
                 print("No aircraft data to save")
                 return
             
-            # Check if file exists and has content
-            file_exists = False
-            try:
-                with open(filename, 'r') as f:
-                    # Check if file has content (more than just header)
-                    lines = f.readlines()
-                    file_exists = len(lines) > 0
-            except FileNotFoundError:
-                file_exists = False
+            file_exists = True
+            include_header = False
             
-            # Open in append mode if file exists, write mode if new
-            mode = 'a' if file_exists else 'w'
-            
-            with open(filename, mode, newline='', encoding='utf-8') as file:
-                fieldnames = aircraft_data[0].keys()
-                writer = csv.DictWriter(file, fieldnames=fieldnames)
+            # Open the file once and keep it for later batches
+            if self._csv_file is None or self._csv_file.name != filename:
+                self.close_csv()
                 
-                # Only write header if it's a new file
-                if not file_exists:
-                    writer.writeheader()
+                # Check if file exists and has content (stat only, no read)
+                file_exists = os.path.exists(filename) and os.path.getsize(filename) > 0
                 
-                writer.writerows(aircraft_data)
+                # Only write header if it's a new file
+                include_header = not file_exists
+                self._csv_file = open(filename, 'ab')
+            
+            # Arrow serializes the typed columns in C, no per-field Python formatting
+            pacsv.write_csv(
+                pa.table(aircraft_data),
+                self._csv_file,
+                write_options=pacsv.WriteOptions(include_header=include_header)
+            )
+            self._csv_file.flush()
                 
-            print(f"{'Appended' if file_exists else 'Created'} {len(aircraft_data)} records to {filename}")
+            print(f"{'Appended' if file_exists else 'Created'} {record_count(aircraft_data)} records to {filename}")
                 
         except Exception as e:
             print(f"Error saving to CSV: {e}")
 
+    def buffer_data(self, aircraft_data, flush_every=10):
+        """
+        Buffer a batch of scrape results and report whether a flush is due
+        
+        Args:
+            aircraft_data: Columns returned by get_aircraft_data
+            flush_every: Number of scrape cycles to buffer between flushes
+        """
+        for field, values in aircraft_data.items():
+            self._buffer.setdefault(field, []).extend(values)
+        self._buf_cycles += 1
+        return self._buf_cycles >= flush_every
+
+    def flush(self, csv_filename, parquet_root, wait=False):
+        """
+        Hand all buffered records to the background writer and clear the buffer
+        
+        Args:
+            csv_filename: CSV file to append to
+            parquet_root: Parquet dataset directory to append to
+            wait: Block until this batch has been written
+        """
+        batch = self._buffer
+        self._buffer = {}
+        self._buf_cycles = 0
+        
+        pending_write = self._io_pool.submit(self._write_batch, batch, csv_filename, parquet_root)
+        if wait:
+            pending_write.result()
+
+    def _write_batch(self, aircraft_data, csv_filename, parquet_root):
+        self.save_to_csv(aircraft_data, csv_filename)
+        self.save_to_parquet(aircraft_data, parquet_root)
+
+    def close(self):
+        # Let queued writes finish before closing the CSV handle
+        self._io_pool.shutdown(wait=True)
+        self.close_csv()
+
+    def close_csv(self):
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+
+    def save_to_parquet(self, aircraft_data, root_path):
+        try:
+            if not aircraft_data:
+                print("No aircraft data to save")
+                return
+            
+            # Store typed columns so readers skip text parsing; each batch is
+            # appended as a new file under its date partition
+            df = pd.DataFrame(aircraft_data)
+            df['timestamp'] = pd.to_datetime(df['timestamp'], format='ISO8601')
+            df['date'] = df['timestamp'].dt.strftime('%Y-%m-%d')
+            table = pa.Table.from_pandas(df, schema=PARQUET_SCHEMA, preserve_index=False)
+            pq.write_to_dataset(table, root_path, partition_cols=['date'])
+            
+            print(f"Appended {record_count(aircraft_data)} records to {root_path}")
+            
+        except Exception as e:
+            print(f"Error saving to Parquet: {e}")
+
 if __name__ == "__main__":
     scrapper = Scrapper()
 
@@ -89,8 +186,13 @@ if __name__ == "__main__":
         while True:
             # Default bounds for Colorado
             aircraft_data = scrapper.get_aircraft_data(37.0, 41.0, -109.0, -102.0)
-            scrapper.save_to_csv(aircraft_data, "aircraft_data.csv")
-            print(f"Total records now: {len(aircraft_data)} this batch")
+            print(f"Total records now: {record_count(aircraft_data)} this batch")
+            
+            # Write every 10 cycles instead of appending each small batch
+            if scrapper.buffer_data(aircraft_data, flush_every=10):
+                scrapper.flush("aircraft_data.csv", "aircraft_data.parquet")
             time.sleep(12)
     except KeyboardInterrupt:
+        # Don't lose the cycles buffered since the last flush
+        scrapper.flush("aircraft_data.csv", "aircraft_data.parquet", wait=True)
         print("Program terminated by user")
\ No newline at end of file